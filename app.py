@@ -1,7 +1,22 @@
+import importlib
+
 import streamlit as st
 from state.init_state import init_session_state
 from navigation.sidebar_precalibrage import render_sidebar_precalibrage
 
+# Page number -> module exposing render(); imported lazily on first display
+PRECALIBRAGE_PAGES = {
+    0: "pages.precalibrage.projects_list",
+    1: "pages.precalibrage.general",
+    2: "pages.precalibrage.production",
+    3: "pages.precalibrage.consommation",
+    4: "pages.precalibrage.parametres",
+    # page 5 (Financier) removed from précalibrage — nothing to do
+}
+BILAN_PAGES = {
+    1: "pages.bilan.energie",
+}
+
 st.set_page_config(page_title="Easy ACC", layout="wide")
 init_session_state()
 
@@ -26,32 +41,15 @@ if current_phase == "precalibrage":
     render_sidebar_precalibrage()
     
     # Route to the correct precalibrage page
-    page_num = st.session_state["precalibrage_page"]
-    
-    if page_num == 0:
-        from pages.precalibrage import projects_list
-        projects_list.render()
-    elif page_num == 1:
-        from pages.precalibrage import general
-        general.render()
-    elif page_num == 2:
-        from pages.precalibrage import production
-        production.render()
-    elif page_num == 3:
-        from pages.precalibrage import consommation
-        consommation.render()
-    elif page_num == 4:
-        from pages.precalibrage import parametres
-        parametres.render()
-    # page_num == 5 (Financier) removed from précalibrage — nothing to do
+    page_module = PRECALIBRAGE_PAGES.get(st.session_state["precalibrage_page"])
+    if page_module:
+        importlib.import_module(page_module).render()
 
 elif current_phase == "bilan":
     from navigation.sidebar_bilan import render_sidebar_bilan
     render_sidebar_bilan()
     
     # Route to the correct bilan page
-    bilan_page = st.session_state["bilan_page"]
-    
-    if bilan_page == 1:
-        from pages.bilan import energie
-        energie.render()
+    page_module = BILAN_PAGES.get(st.session_state["bilan_page"])
+    if page_module:
+        importlib.import_module(page_module).render()
@@ -9,6 +9,8 @@ import re
 from typing import Tuple, Dict, Any, Optional
 import streamlit as st
 
+from .utils import fast_to_datetime
+
 def read_curve(file_or_df: Any) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     metadata: Dict[str, Any] = {
         "source_file": None,
@@ -55,7 +57,9 @@ def read_curve(file_or_df: Any) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         raise ValueError(f"Impossible de détecter les colonnes date et valeur dans {raw_df.columns.tolist()}")
 
     metadata["detected_format"] = fmt
-    df = raw_df.copy()
+    # Pas de copie ici : chaque branche ci-dessous produit déjà un nouveau DataFrame
+    # (filtrage SGE ou sélection [dt_col, val_col]) avant toute modification.
+    df = raw_df
     try:
         st.info(f"Format détecté : {fmt}")
     except ImportError:
@@ -82,7 +86,7 @@ def read_curve(file_or_df: Any) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         df["datetime"] = pd.to_datetime(df["datetime"], format="%Y%m%d:%H%M", errors="coerce")
         df = df[df["datetime"].notna()]
         # Parsing valeur (virgule ou point)
-        df["value"] = df["value"].astype(str).str.replace(",", ".").apply(pd.to_numeric, errors="coerce")
+        df["value"] = _parse_numeric(df["value"])
         df = df[df["value"].notna()]
         # Normalisation en kW
         df["value"] = df["value"] / 1000.0
@@ -97,7 +101,7 @@ def read_curve(file_or_df: Any) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     df.columns = ["datetime", "value"]
 
     # Parsing Date : on essaie le format jour en premier (standard FR)
-    df["datetime"] = pd.to_datetime(df["datetime"], errors="coerce", dayfirst=True)
+    df["datetime"] = fast_to_datetime(df["datetime"], dayfirst=True)
     df = df[df["datetime"].notna()]
     if df["datetime"].dt.tz is not None:
         if fmt in ("ALEX", "EMS"):
@@ -114,7 +118,7 @@ def read_curve(file_or_df: Any) -> Tuple[pd.DataFrame, Dict[str, Any]]:
             df["datetime"] = df["datetime"].dt.tz_localize(None)
 
     # Parsing Valeur : gestion des virgules françaises
-    df["value"] = df["value"].astype(str).str.replace(",", ".").apply(pd.to_numeric, errors="coerce")
+    df["value"] = _parse_numeric(df["value"])
     df = df[df["value"].notna()]
 
     # 5. Normalisation en kW
@@ -132,6 +136,10 @@ def read_curve(file_or_df: Any) -> Tuple[pd.DataFrame, Dict[str, Any]]:
 
     return df[["value"]], metadata
 
+def _parse_numeric(series: pd.Series) -> pd.Series:
+    """Convertit une colonne texte en nombres (virgule française acceptée), en un seul appel vectorisé."""
+    return pd.to_numeric(series.astype(str).str.replace(",", ".", regex=False), errors="coerce")
+
 def _is_data_row(row: pd.Series) -> bool:
     """Vérifie si une ligne ressemble à de la donnée (Date, Chiffre) plutôt qu'à un en-tête."""
     try:
@@ -44,7 +44,8 @@ def resample_curve(
         method = "aggregate" if target_min >= source_min else "interpolate"
 
     if method == "aggregate":
-        resampled = df.resample(target_freq).agg({"value": lambda x: x.sum(min_count=1)})
+        # Built-in sum keeps the aggregation in the Cython groupby kernel
+        resampled = df[["value"]].resample(target_freq).sum(min_count=1)
     else:
         resampled = df.resample(target_freq)["value"].interpolate(method="linear").to_frame()
 
@@ -11,6 +11,7 @@ import pytest
 from services.curve_processing.io import read_curve
 from services.curve_processing.imputer import impute_by_week_shift
 from services.curve_processing.integration import process_curve
+from services.curve_processing.utils import fast_to_datetime
 
 
 class TestReadCurve:
@@ -99,6 +100,26 @@ class TestReadCurve:
         print(f"✓ ALEX: {len(df)} rows, freq={meta['frequency']}, unit={meta['unit']}")
 
 
+class TestFastToDatetime:
+    """Test explicit-format datetime parsing."""
+
+    def test_dayfirst_format(self):
+        """French day-first dates are parsed with the guessed format."""
+        s = pd.Series(["02/01/2024 00:00", "02/01/2024 01:00", None, "13/01/2024 02:00"])
+        parsed = fast_to_datetime(s, dayfirst=True)
+        assert parsed.iloc[0] == pd.Timestamp("2024-01-02 00:00")
+        assert parsed.iloc[3] == pd.Timestamp("2024-01-13 02:00")
+        assert pd.isna(parsed.iloc[2])
+
+    def test_fallback_on_mixed_formats(self):
+        """Too many values not matching the guessed format trigger per-element parsing."""
+        s = pd.Series([" 02/01/2024 00:00", "2024-01-02 01:00", "not a date"])
+        parsed = fast_to_datetime(s, dayfirst=True)
+        assert parsed.iloc[0] == pd.Timestamp("2024-01-02 00:00")
+        assert parsed.iloc[1] == pd.Timestamp("2024-01-02 01:00")
+        assert pd.isna(parsed.iloc[2])
+
+
 class TestImputation:
     """Test imputation algorithm."""
 
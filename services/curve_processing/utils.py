@@ -1,6 +1,8 @@
 """Utility functions for curve processing."""
 
+import numpy as np
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
 from typing import Optional, Tuple
 
 
@@ -15,6 +17,31 @@ def detect_timestep(df: pd.DataFrame, datetime_index: pd.DatetimeIndex) -> Optio
         return None
 
 
+def fast_to_datetime(series: pd.Series, dayfirst: bool = True, max_nat_ratio: float = 0.1) -> pd.Series:
+    """Parse a datetime column with an explicit format guessed from its first value.
+
+    The format is applied to the whole (stripped) column with the conversion cache
+    enabled. Falls back to per-element parsing (``format="mixed"``) when more than
+    `max_nat_ratio` of the non-null values fail to match that format.
+    """
+    sample = series.dropna()
+    if len(sample) == 0:
+        return pd.to_datetime(series, errors="coerce", dayfirst=dayfirst)
+
+    # Same whitespace handling for the column as for the sample the format comes from
+    if pd.api.types.infer_dtype(sample, skipna=True) == "string":
+        series = series.str.strip()
+
+    fmt = guess_datetime_format(str(sample.iloc[0]).strip(), dayfirst=dayfirst)
+    if fmt is not None:
+        parsed = pd.to_datetime(series, format=fmt, errors="coerce", cache=True)
+        if parsed[series.notna()].isna().mean() <= max_nat_ratio:
+            return parsed
+
+    # Without format, pandas would reuse the format guessed from the first value
+    return pd.to_datetime(series, format="mixed", errors="coerce", dayfirst=dayfirst)
+
+
 def check_continuity(datetime_index: pd.DatetimeIndex, max_gap_hours: int = 2) -> Tuple[bool, list]:
     """Check for temporal continuity and detect gaps > max_gap_hours.
 
@@ -24,13 +51,13 @@ def check_continuity(datetime_index: pd.DatetimeIndex, max_gap_hours: int = 2) -
     if len(datetime_index) < 2:
         return True, []
 
-    diffs = datetime_index.to_series().diff()
+    diffs = datetime_index[1:] - datetime_index[:-1]
     max_diff = pd.Timedelta(hours=max_gap_hours)
 
-    gaps = []
-    for i, (idx, diff) in enumerate(diffs[1:].items(), start=1):
-        if diff > max_diff:
-            gap_hours = diff.total_seconds() / 3600
-            gaps.append((datetime_index[i - 1], datetime_index[i], gap_hours))
+    # Only the offending positions are visited in Python
+    gaps = [
+        (datetime_index[i], datetime_index[i + 1], diffs[i].total_seconds() / 3600)
+        for i in np.flatnonzero(diffs > max_diff)
+    ]
 
     return len(gaps) == 0, gaps
@@ -22,29 +22,36 @@ def validate_curve(df: pd.DataFrame) -> Dict:
         report["errors"].append("DataFrame is empty")
         return report
 
-    if df.index.duplicated().any():
-        dup_count = int(df.index.duplicated().sum())
+    # Each mask is computed once and reused for both the test and the count
+    dup_count = int(df.index.duplicated().sum())
+    if dup_count > 0:
         report["warnings"].append(f"Found {dup_count} duplicate timestamps")
 
-    nan_count = int(df.isna().sum().sum())
+    nan_count = int(df.isna().to_numpy().sum())
     if nan_count > 0:
         report["warnings"].append(f"Found {nan_count} NaN values")
 
-    if not df.index.is_monotonic_increasing:
+    is_monotonic = df.index.is_monotonic_increasing
+    if not is_monotonic:
         report["is_valid"] = False
         report["errors"].append("Timestamps are not monotonically increasing")
 
-    now = pd.Timestamp.now()
-    if df.index.tz is not None:
-        now = now.tz_localize(df.index.tz) if now.tz is None else now.tz_convert(df.index.tz)
-    if (df.index > now).any():
-        report["warnings"].append(f"Found {int((df.index > now).sum())} future timestamps")
+    # Built directly in the index timezone (naive when the index is naive)
+    now = pd.Timestamp.now(tz=df.index.tz)
+    if is_monotonic:
+        # Sorted index: binary search instead of a full boolean mask
+        future_count = len(df.index) - int(df.index.searchsorted(now, side="right"))
+    else:
+        future_count = int((df.index > now).sum())
+    if future_count > 0:
+        report["warnings"].append(f"Found {future_count} future timestamps")
 
     is_continuous, gaps = check_continuity(df.index, max_gap_hours=2)
     if not is_continuous:
         report["warnings"].append(f"Found {len(gaps)} temporal gaps > 2h")
-        for gap_start, gap_end, gap_hours in gaps:
-            report["warnings"].append(f"  {gap_start} → {gap_end} ({gap_hours:.1f}h)")
+        report["warnings"].extend(
+            f"  {gap_start} → {gap_end} ({gap_hours:.1f}h)" for gap_start, gap_end, gap_hours in gaps
+        )
 
     if "value" in df.columns:
         negative_count = int((df["value"] < 0).sum())
@@ -1,11 +1,13 @@
 import os
 import json
+from contextlib import contextmanager
 from datetime import datetime
-from sqlalchemy import create_engine, select, func
+from sqlalchemy import create_engine, select, update, delete, func, inspect
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import IntegrityError
 from services.models import Base, Project, Dataset
-from services.state_serializer import serialize_state, deserialize_state
+from services.state_serializer import serialize_state, deserialize_state, is_json_native, LazyState
 
 # Exception for Gatekeeper
 class UnsupportedFileTypeError(Exception):
@@ -19,9 +21,54 @@ DATABASE_URL = f"sqlite:///{DB_PATH}"
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine on which init_db last ran (see _ensure_schema)
+_schema_engine = None
+
 def init_db():
     """Initialize the SQLite database and create tables."""
+    global _schema_engine
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        # Databases created by an older version may hold several datasets with the
+        # same (project_id, name): keep the newest one so the unique index can be built.
+        existing = {ix["name"] for ix in inspect(conn).get_indexes(Dataset.__tablename__)}
+        if "ix_datasets_pid_name" not in existing:
+            _delete_duplicate_datasets(conn)
+        # create_all skips tables that already exist, and their indexes with them:
+        # add any index missing from a database created by an older version.
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+    _schema_engine = engine
+
+def _ensure_schema():
+    """Run init_db once per engine: save_dataset's upsert needs the unique index, even on an older database."""
+    if _schema_engine is not engine:
+        init_db()
+
+def _delete_duplicate_datasets(conn):
+    """Delete all but the newest dataset (latest created_at, then highest id) of each (project_id, name)."""
+    ranked = select(
+        Dataset.id,
+        func.row_number().over(
+            partition_by=(Dataset.project_id, Dataset.name),
+            order_by=(Dataset.created_at.desc(), Dataset.id.desc()),
+        ).label("rank"),
+    ).subquery()
+    conn.execute(delete(Dataset).where(Dataset.id.in_(select(ranked.c.id).where(ranked.c.rank > 1))))
+
+@contextmanager
+def session_scope():
+    """Transactional scope: commit on success, rollback on error, always close."""
+    session = SessionLocal()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
 
 def get_db():
     """Dependency for session management."""
@@ -38,8 +85,7 @@ def save_project(name: str, current_phase: str, state_dict: dict, project_id: in
     Save or update a project atomically.
     Returns the project ID.
     """
-    session = SessionLocal()
-    try:
+    with session_scope() as session:
         if project_id:
             project = session.get(Project, project_id)
             if not project:
@@ -57,19 +103,13 @@ def save_project(name: str, current_phase: str, state_dict: dict, project_id: in
             project = Project(name=name, current_phase=current_phase, state_data=state_dict)
             session.add(project)
 
-        session.commit()
-        session.refresh(project)
+        # Flush to get the ID; the commit happens when the scope exits
+        session.flush()
         return project.id
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.close()
 
 def load_project(project_id: int):
     """Load a project by ID."""
-    session = SessionLocal()
-    try:
+    with session_scope() as session:
         project = session.get(Project, project_id)
         if project:
             return {
@@ -80,32 +120,26 @@ def load_project(project_id: int):
                 "updated_at": project.updated_at
             }
         return None
-    finally:
-        session.close()
 
 def list_projects():
     """List all projects."""
-    session = SessionLocal()
-    try:
-        stmt = select(Project).order_by(Project.updated_at.desc())
-        projects = session.scalars(stmt).all()
+    with session_scope() as session:
+        # Select only the listed columns: plain rows, no ORM entities (state_data stays unread)
+        stmt = select(
+            Project.id, Project.name, Project.updated_at, Project.current_phase
+        ).order_by(Project.updated_at.desc())
+        rows = session.execute(stmt).all()
         return [
-            {"id": p.id, "name": p.name, "updated_at": p.updated_at, "current_phase": p.current_phase}
-            for p in projects
+            {"id": r.id, "name": r.name, "updated_at": r.updated_at, "current_phase": r.current_phase}
+            for r in rows
         ]
-    finally:
-        session.close()
 
 def delete_project(project_id: int):
     """Delete a project and its datasets (Cascade)."""
-    session = SessionLocal()
-    try:
+    with session_scope() as session:
         project = session.get(Project, project_id)
         if project:
             session.delete(project)
-            session.commit()
-    finally:
-        session.close()
 
 # --- Dataset Services ---
 
@@ -134,31 +168,27 @@ def save_dataset(project_id: int, name: str, type: str, data: dict, metadata: di
     if file_type != "json":
         validate_file_type(f"test.{file_type}") # Simple check, or relax if file_type is extension
 
-    session = SessionLocal()
-    try:
-        # Atomic Transaction Context
-        project = session.get(Project, project_id)
-        if not project:
-            raise ValueError(f"Project with ID {project_id} not found.")
-
-        # Calculate Size (Estimate JSON size) after first creating a serializable snapshot
-        serializable_data = serialize_state(data)
-        data_json_str = json.dumps(serializable_data)
-        size_bytes = len(data_json_str.encode('utf-8'))
+    # Calculate Size (Estimate JSON size) after first creating a serializable snapshot.
+    # json.dumps escapes non-ASCII by default, so the string length already is the
+    # byte size: no need to encode a second copy of the payload.
+    # Plain JSON payloads are stored as-is, skipping the serialize_state copy
+    serializable_data = data if is_json_native(data) else serialize_state(data)
+    size_bytes = len(json.dumps(serializable_data))
 
-        # Check if dataset exists for this project and name
-        stmt = select(Dataset).where(Dataset.project_id == project_id, Dataset.name == name)
-        dataset = session.scalar(stmt)
+    _ensure_schema()
+    try:
+        with session_scope() as session:
+            # Atomic State Management: bump the project timestamp, which also
+            # checks that the project exists (no separate SELECT)
+            touched = session.execute(
+                update(Project).where(Project.id == project_id).values(updated_at=datetime.now())
+            )
+            if touched.rowcount == 0:
+                raise ValueError(f"Project with ID {project_id} not found.")
 
-        if dataset:
-            dataset.type = type
-            dataset.data = serializable_data
-            dataset.metadata_info = metadata
-            dataset.file_type = file_type
-            dataset.size_bytes = size_bytes
-            # dataset.created_at is fixed, maybe add updated_at to dataset model if needed
-        else:
-            dataset = Dataset(
+            # Upsert on the (project_id, name) unique index: one statement instead of
+            # SELECT then UPDATE/INSERT. created_at is kept on update.
+            stmt = sqlite_insert(Dataset).values(
                 project_id=project_id,
                 name=name,
                 type=type,
@@ -167,73 +197,72 @@ def save_dataset(project_id: int, name: str, type: str, data: dict, metadata: di
                 file_type=file_type,
                 size_bytes=size_bytes
             )
-            session.add(dataset)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Dataset.project_id, Dataset.name],
+                set_={
+                    Dataset.type: stmt.excluded.type,
+                    Dataset.data: stmt.excluded.data,
+                    Dataset.metadata_info: stmt.excluded.metadata,
+                    Dataset.file_type: stmt.excluded.file_type,
+                    Dataset.size_bytes: stmt.excluded.size_bytes,
+                },
+            ).returning(Dataset.id)
 
-        # Atomic State Management: Update Project Timestamp to reflect activity
-        project.updated_at = datetime.now()
-        
-        session.commit()
-        return dataset.id
+            # The commit happens when the scope exits
+            return session.scalar(stmt)
     except IntegrityError:
-        session.rollback()
         raise ValueError("Database constraint error.")
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.close()
 
 def list_datasets(project_id: int, dataset_type: str = None):
     """List datasets for a specific project."""
-    session = SessionLocal()
-    try:
-        stmt = select(Dataset).where(Dataset.project_id == project_id)
+    with session_scope() as session:
+        # Select only the listed columns: the JSON payload is never loaded
+        stmt = select(
+            Dataset.id, Dataset.name, Dataset.type, Dataset.created_at, Dataset.size_bytes
+        ).where(Dataset.project_id == project_id)
         if dataset_type:
             stmt = stmt.where(Dataset.type == dataset_type)
         stmt = stmt.order_by(Dataset.created_at.desc())
-        datasets = session.scalars(stmt).all()
+        rows = session.execute(stmt).all()
         return [
-            {"id": d.id, "name": d.name, "type": d.type, "created_at": d.created_at, "size_bytes": d.size_bytes}
-            for d in datasets
+            {"id": r.id, "name": r.name, "type": r.type, "created_at": r.created_at, "size_bytes": r.size_bytes}
+            for r in rows
         ]
-    finally:
-        session.close()
 
-def load_dataset(dataset_id: int):
-    """Load a dataset by ID."""
-    session = SessionLocal()
-    try:
+def load_dataset(dataset_id: int, lazy_keys=()):
+    """
+    Load a dataset by ID.
+    Keys of a dict payload listed in lazy_keys (e.g. "consumers_df", "producers_df")
+    are only deserialized when first accessed, through a LazyState view.
+    """
+    with session_scope() as session:
         dataset = session.get(Dataset, dataset_id)
         if dataset:
+            raw = dataset.data
+            if lazy_keys and isinstance(raw, dict) and "__type__" not in raw:
+                data = LazyState(raw, lazy_keys)
+            else:
+                data = deserialize_state(raw)
             return {
                 "id": dataset.id,
                 "project_id": dataset.project_id,
                 "name": dataset.name,
                 "type": dataset.type,
-                "data": deserialize_state(dataset.data),
+                "data": data,
                 "metadata": dataset.metadata_info,
                 "file_type": dataset.file_type
             }
         return None
-    finally:
-        session.close()
 
 def delete_dataset(dataset_id: int):
     """Delete a dataset."""
-    session = SessionLocal()
-    try:
+    with session_scope() as session:
         dataset = session.get(Dataset, dataset_id)
         if dataset:
             session.delete(dataset)
-            session.commit()
-    finally:
-        session.close()
 
 def get_storage_usage():
     """Calculate total storage used by datasets."""
-    session = SessionLocal()
-    try:
+    with session_scope() as session:
         total_bytes = session.scalar(select(func.sum(Dataset.size_bytes)))
         return total_bytes if total_bytes else 0
-    finally:
-        session.close()
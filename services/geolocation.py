@@ -1,10 +1,11 @@
-from typing import Dict
+from typing import Dict, Iterable
 import re
 import streamlit as st
 from geopy.geocoders import Nominatim
 import ssl
 import certifi
 import geopy.geocoders
+from geopy.extra.rate_limiter import RateLimiter
 
 # Fix for macOS SSL certificate errors: explicitly use certifi's CA bundle & create a context
 ctx = ssl.create_default_context(cafile=certifi.where())
@@ -19,6 +20,9 @@ GEO_DATABASE = {
     "Nice": {"lat": 43.7102, "lng": 7.2620, "epci": "Métropole Nice Côte d'Azur"},
 }
 
+# French postal code: 5 digits
+_POSTAL_CODE_RE = re.compile(r'\b(\d{5})\b')
+
 
 def extract_postal_code(address: str) -> str:
     """
@@ -32,11 +36,40 @@ def extract_postal_code(address: str) -> str:
         Postal code string (5 digits) or empty string if not found
     """
     # Find 5-digit sequence in the address
-    match = re.search(r'\b(\d{5})\b', address)
+    match = _POSTAL_CODE_RE.search(address)
     return match.group(1) if match else ""
 
 
-@st.cache_data(ttl=3600)
+# Nominatim usage policy: at most one request per second
+NOMINATIM_MIN_DELAY_S = 1.0
+
+_geocode = None
+
+
+def _get_geocode():
+    """Shared, rate-limited Nominatim geocode function (created on first use).
+
+    A single geolocator keeps its HTTP session, and thus its connection, alive
+    across lookups; the RateLimiter spaces live requests across all callers.
+    """
+    global _geocode
+    if _geocode is None:
+        geopy.geocoders.options.default_timeout = 10
+        geolocator = Nominatim(user_agent="acc_app_v1", ssl_context=ctx)
+        _geocode = RateLimiter(
+            geolocator.geocode,
+            min_delay_seconds=NOMINATIM_MIN_DELAY_S,
+            max_retries=0,
+            swallow_exceptions=False,
+        )
+    return _geocode
+
+
+def _address_key(address: str) -> str:
+    """Normalize an address for caching (surrounding/repeated whitespace ignored)."""
+    return " ".join(address.split())
+
+
 def get_coordinates_from_address(address: str) -> Dict[str, float]:
     """
     Retrieve coordinates from address using Nominatim API (OpenStreetMap).
@@ -46,14 +79,28 @@ def get_coordinates_from_address(address: str) -> Dict[str, float]:
     # Try mock database first
     if address in GEO_DATABASE:
         return GEO_DATABASE[address]
-    
-    # Fall back to live API using Nominatim
+
+    # Same address typed differently -> same cache entry
+    return _geocode_address(_address_key(address))
+
+
+def batch_geocode(addresses: Iterable[str]) -> Dict[str, Dict[str, float]]:
+    """
+    Retrieve coordinates for several addresses.
+    Each distinct address is resolved once (cache first, then live API), and live
+    requests are spaced to respect Nominatim's 1 request/second policy.
+
+    Returns:
+        dict mapping each input address to its coordinates dict
+    """
+    return {address: get_coordinates_from_address(address) for address in dict.fromkeys(addresses)}
+
+
+@st.cache_data(ttl=3600)
+def _geocode_address(address: str) -> Dict[str, float]:
+    """Live Nominatim lookup for a normalized address (see get_coordinates_from_address)."""
     try:
-        geopy.geocoders.options.default_ssl_context = ctx
-        geopy.geocoders.options.default_timeout = 10
-        
-        geolocator = Nominatim(user_agent="acc_app_v1", ssl_context=ctx)
-        location = geolocator.geocode(
+        location = _get_geocode()(
             address, 
             country_codes="FR",  # Forcer France
             timeout=10,          # Timeout prolongé
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, JSON, DateTime, LargeBinary, ForeignKey, func, Text
+from sqlalchemy import Integer, String, JSON, DateTime, LargeBinary, ForeignKey, Index, func, Text
 from datetime import datetime
 from typing import List, Optional
 
@@ -8,6 +8,8 @@ class Base(DeclarativeBase):
 
 class Project(Base):
     __tablename__ = "projects"
+    # list_projects orders by updated_at
+    __table_args__ = (Index("ix_projects_updated", "updated_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String, unique=True, nullable=False)
@@ -23,6 +25,12 @@ class Project(Base):
 
 class Dataset(Base):
     __tablename__ = "datasets"
+    __table_args__ = (
+        # save_dataset upsert lookup: one dataset per (project, name)
+        Index("ix_datasets_pid_name", "project_id", "name", unique=True),
+        # list_datasets: filter by project (and type), newest first
+        Index("ix_datasets_pid_type_created", "project_id", "type", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
@@ -1,5 +1,7 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import os
 from typing import Tuple, Optional
 import logging  # New import for logging
 
@@ -7,11 +9,24 @@ import pvlib
 from pvlib.iotools import get_pvgis_tmy
 from pvlib.pvsystem import pvwatts_dc, pvwatts_losses
 from pvlib.location import Location
-from pvlib.irradiance import get_total_irradiance
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)  # Set logging level
 
+# numba is optional: when it imports, solar position and POA use compiled kernels.
+# A missing or broken install (e.g. built against another NumPy) falls back to NumPy.
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Solar position: pvlib's Numba-compiled SPA when numba is installed, NumPy SPA otherwise
+SOLPOS_METHOD = "nrel_numba" if HAS_NUMBA else "nrel_numpy"
+
+# Ground reflectance used for the POA transposition (pvlib's default)
+ALBEDO = 0.25
+
 
 @st.cache_data(ttl=3600, show_spinner=False)
 def fetch_tmy(lat: float, lon: float, usehorizon: bool = True) -> Tuple[pd.DataFrame, dict]:
@@ -53,6 +68,107 @@ def fetch_tmy(lat: float, lon: float, usehorizon: bool = True) -> Tuple[pd.DataF
     return data, metadata
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _poa_for_site(lat: float, lon: float, tilt_deg: float, azimuth_deg: float) -> pd.DataFrame:
+    """Compute plane-of-array irradiance and cell temperature for a site and orientation.
+
+    This is the expensive, power-independent part of compute_pv_curve (solar
+    position + transposition): it is cached on these 4 values only, so changing
+    the peak power or the losses reuses it.
+
+    Returns:
+        A DataFrame on the TMY index with columns 'poa_global' and 't_cell'.
+    """
+    weather, meta = fetch_tmy(lat, lon, usehorizon=True)
+
+    # Create Location object for solar position calculations
+    location = Location(latitude=lat, longitude=lon)
+
+    # Calculate solar position
+    solar_position = location.get_solarposition(
+        weather.index, method=SOLPOS_METHOD, numthreads=os.cpu_count() or 4
+    )
+
+    # Calculate POA (Plane of Array) irradiance based on tilt and azimuth
+    # This is the key: we need to transpose GHI/DNI/DHI to the panel's plane
+    poa_global = poa_isotropic(
+        solar_position['apparent_zenith'].to_numpy(),
+        solar_position['azimuth'].to_numpy(),
+        np.asarray(weather.get('dni', 0), dtype=float),
+        np.asarray(weather.get('ghi', 0), dtype=float),
+        np.asarray(weather.get('dhi', 0), dtype=float),
+        tilt_deg,
+        azimuth_deg,
+    )
+
+    # Estimate cell temperature: T_cell = T_air + 0.0045 * POA
+    # (Standard PVWatts approximation)
+    t_cell = weather['temp_air'].to_numpy() + 0.0045 * poa_global
+
+    return pd.DataFrame({'poa_global': poa_global, 't_cell': t_cell}, index=weather.index)
+
+
+if HAS_NUMBA:
+    # No fastmath: it assumes NaN-free inputs, and TMY columns may contain NaN
+    @njit(parallel=True, cache=True)
+    def _poa_isotropic_kernel(zenith_deg, azimuth_deg, dni, ghi, dhi,
+                              cos_tilt, sin_tilt, surface_azimuth_deg, sky_factor, ground_factor):
+        """Compiled per-hour loop of poa_isotropic (trig of the tilt precomputed)."""
+        n = zenith_deg.shape[0]
+        out = np.empty(n)
+        for i in prange(n):
+            zen = np.radians(zenith_deg[i])
+            cos_aoi = cos_tilt * np.cos(zen) + sin_tilt * np.sin(zen) * np.cos(np.radians(azimuth_deg[i] - surface_azimuth_deg))
+            # Same clipping as np.clip, NaN kept as NaN
+            if cos_aoi < 0.0:
+                cos_aoi = 0.0
+            elif cos_aoi > 1.0:
+                cos_aoi = 1.0
+            out[i] = dni[i] * cos_aoi + (dhi[i] * sky_factor + ghi[i] * ground_factor)
+        return out
+else:
+    _poa_isotropic_kernel = None
+
+
+def poa_isotropic(
+    zenith_deg: np.ndarray,
+    azimuth_deg: np.ndarray,
+    dni: np.ndarray,
+    ghi: np.ndarray,
+    dhi: np.ndarray,
+    tilt_deg: float,
+    surface_azimuth_deg: float,
+    albedo: float = ALBEDO,
+) -> np.ndarray:
+    """Plane-of-array global irradiance with the isotropic sky model.
+
+    Closed form of pvlib's get_total_irradiance with its defaults (isotropic
+    model, albedo 0.25), computed in one pass over the arrays:
+    POA = DNI * max(cos(AOI), 0) + DHI * (1 + cos(tilt)) / 2 + GHI * albedo * (1 - cos(tilt)) / 2
+    Runs as a compiled parallel loop when numba is installed, as NumPy array
+    expressions otherwise.
+    """
+    tilt = np.radians(tilt_deg)
+    cos_tilt = np.cos(tilt)
+    sin_tilt = np.sin(tilt)
+    if _poa_isotropic_kernel is not None:
+        # The kernel takes float64 1-D arrays only (a missing column is passed as a scalar 0)
+        shape = np.shape(zenith_deg)
+        arrays = [
+            np.broadcast_to(np.asarray(x, dtype=np.float64), shape)
+            for x in (zenith_deg, azimuth_deg, dni, ghi, dhi)
+        ]
+        return _poa_isotropic_kernel(
+            *arrays,
+            float(cos_tilt), float(sin_tilt), float(surface_azimuth_deg),
+            0.5 * (1.0 + cos_tilt), 0.5 * albedo * (1.0 - cos_tilt),
+        )
+    zen = np.radians(zenith_deg)
+    cos_aoi = cos_tilt * np.cos(zen) + sin_tilt * np.sin(zen) * np.cos(np.radians(azimuth_deg - surface_azimuth_deg))
+    np.clip(cos_aoi, 0.0, 1.0, out=cos_aoi)
+    return dni * cos_aoi + (dhi * (0.5 * (1.0 + cos_tilt)) + ghi * (0.5 * albedo * (1.0 - cos_tilt)))
+
+
 @st.cache_data(ttl=3600, show_spinner=False)
 def compute_pv_curve(
     lat: float,
@@ -83,40 +199,16 @@ def compute_pv_curve(
         lat = round(float(lat), 4)
         lon = round(float(lon), 4)
         
-        weather, meta = fetch_tmy(lat, lon, usehorizon=True)
+        # Solar position + transposition, cached per site/orientation
+        poa = _poa_for_site(lat, lon, float(tilt_deg), float(azimuth_deg))
         
         # Convert peakpower to watts
         peakpower_w = float(peakpower_kw) * 1000.0
         
-        # Create Location object for solar position calculations
-        location = Location(latitude=lat, longitude=lon)
-        
-        # Calculate solar position
-        solar_position = location.get_solarposition(weather.index)
-        
-        # Calculate POA (Plane of Array) irradiance based on tilt and azimuth
-        # This is the key: we need to transpose GHI/DNI/DHI to the panel's plane
-        poa_irradiance = get_total_irradiance(
-            surface_tilt=tilt_deg,
-            surface_azimuth=azimuth_deg,
-            solar_zenith=solar_position['apparent_zenith'],
-            solar_azimuth=solar_position['azimuth'],
-            dni=weather.get('dni', 0),
-            ghi=weather.get('ghi', 0),
-            dhi=weather.get('dhi', 0)
-        )
-        
-        # Use POA global irradiance for DC power calculation
-        poa_global = poa_irradiance['poa_global']
-        
-        # Estimate cell temperature: T_cell = T_air + 0.0045 * POA
-        # (Standard PVWatts approximation)
-        t_cell = weather['temp_air'] + 0.0045 * poa_global
-        
         # Compute DC power using pvwatts_dc with POA irradiance
         pdc = pvwatts_dc(
-            g_poa_effective=poa_global,  # Now using actual POA irradiance
-            temp_cell=t_cell,
+            g_poa_effective=poa['poa_global'],  # Now using actual POA irradiance
+            temp_cell=poa['t_cell'],
             pdc0=peakpower_w,
             gamma_pdc=-0.005  # Standard PVWatts temperature coefficient
         )
@@ -125,18 +217,15 @@ def compute_pv_curve(
         # Using default loss parameters
         loss_pct_system = pvwatts_losses()
         
-        # Apply inverter efficiency (~0.96) and system losses to get AC power
-        # AC = DC * inverter_efficiency * (1 - system_losses/100)
+        # Apply inverter efficiency (~0.96), system losses and the additional
+        # losses in one scalar factor (with the W -> kW conversion):
+        # AC = DC * inverter_efficiency * (1 - system_losses/100) * (1 - losses_pct/100)
         inverter_eff = 0.96
-        pac = pdc * inverter_eff * (1.0 - loss_pct_system / 100.0)
+        extra_loss_factor = (1.0 - losses_pct / 100.0) if losses_pct and losses_pct > 0 else 1.0
+        k = inverter_eff * (1.0 - loss_pct_system / 100.0) * extra_loss_factor / 1000.0
         
         # Build output DataFrame
-        df = pd.DataFrame(index=weather.index)
-        df['P_ac_kW'] = pac / 1000.0  # Convert W to kW
-        
-        # Apply additional system losses (simple scalar)
-        if losses_pct and losses_pct > 0:
-            df['P_ac_kW'] = df['P_ac_kW'] * (1.0 - losses_pct / 100.0)
+        df = pd.DataFrame({'P_ac_kW': np.asarray(pdc) * k}, index=poa.index)
         
         # Set default dates if not provided
         if start_date is None:
@@ -170,18 +259,22 @@ def compute_pv_curve(
         hours_needed = int((end_date - start_date).total_seconds() / 3600) + 1
         
         # TMY data repeats annually, so we can tile it if needed for multi-year periods
-        tmy_hours = len(df)
+        # (work on the underlying array: one copy, no per-repeat DataFrame)
+        values = df['P_ac_kW'].to_numpy()
+        tmy_hours = len(values)
         if hours_needed > tmy_hours:
             # Multi-year period: tile the TMY data
             num_repeats = (hours_needed // tmy_hours) + 1
-            df = pd.concat([df] * num_repeats, ignore_index=True)
-            df = df.iloc[:hours_needed]
+            values = np.tile(values, num_repeats)[:hours_needed]
         elif hours_needed < tmy_hours:
             # Less than a year: take subset
-            df = df.iloc[:hours_needed]
+            values = values[:hours_needed]
         
         # Create clean date range based on selected period
-        df.index = pd.date_range(start=start_date, periods=len(df), freq='h')
+        df = pd.DataFrame(
+            {'P_ac_kW': values},
+            index=pd.date_range(start=start_date, periods=len(values), freq='h'),
+        )
         
         # Ensure we don't go past end_date
         df = df[df.index <= end_date]
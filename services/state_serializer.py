@@ -1,34 +1,114 @@
 import pandas as pd
 import json
+import os
+import re
+import base64
 import numpy as np
-from io import StringIO
+import pyarrow as pa
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Keys to exclude from persistence (transient widgets). Tested inline as
+# `type(k) is str and (k.startswith(_EXCLUDE_PREFIXES) or k in _EXCLUDE_EXACT)`:
+# str.startswith over the tuple measured faster than a compiled alternation regex.
+_EXCLUDE_PREFIXES = ("prev_", "next_", "load_", "del_", "delete_", "confirm_", "edit_", "dup_", "upload_", "FormSubmitter")
+_EXCLUDE_EXACT = frozenset({"use_container_width"})
+
+# Shape of the timestamps written by to_json(date_format="iso")
+_ISO_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?$")
+
+# Upper bound on threads encoding DataFrames in serialize_state
+_MAX_ENCODE_WORKERS = 4
+
+# JSON containers walked by deserialize_state (matched by exact type)
+_CONTAINER_TYPES = (dict, list)
+
+# Beyond this nesting depth is_json_native gives up and lets serialize_state decide
+_JSON_NATIVE_MAX_DEPTH = 32
+_JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+def is_json_native(obj, _depth=0):
+    """
+    Return True if serialize_state(obj) would return obj unchanged: only dicts with
+    str keys (none of them transient), lists and JSON scalars, nested at most
+    _JSON_NATIVE_MAX_DEPTH levels. Stops at the first value that needs conversion.
+    """
+    if type(obj) in _JSON_SCALAR_TYPES:
+        return True
+    if _depth >= _JSON_NATIVE_MAX_DEPTH:
+        return False
+    if type(obj) is list:
+        return all(is_json_native(v, _depth + 1) for v in obj)
+    if type(obj) is dict:
+        return all(
+            type(k) is str
+            and not (k.startswith(_EXCLUDE_PREFIXES) or k in _EXCLUDE_EXACT)
+            and is_json_native(v, _depth + 1)
+            for k, v in obj.items()
+        )
+    return False
+
 def serialize_state(state):
     """
-    Recursively serialize a dictionary (state) into a JSON-compatible format.
+    Serialize a dictionary (state) into a JSON-compatible format.
     Handles pandas DataFrames by converting them to dictionaries with metadata.
+    The tree is walked with an explicit stack instead of recursion: each container
+    is created first, then the pending children are filled in place.
     """
-    if isinstance(state, dict):
-        new_dict = {}
-        # Keys to exclude from persistence (transient widgets)
-        exclude_prefixes = ("prev_", "next_", "load_", "del_", "delete_", "confirm_", "edit_", "dup_", "upload_", "FormSubmitter")
-        
-        for k, v in state.items():
-            # Skip keys that are transient widgets
-            if isinstance(k, str) and (k.startswith(exclude_prefixes) or k == "use_container_width"):
-                continue
-            # Ensure key is a string (JSON requirement)
-            new_dict[str(k)] = serialize_state(v)
-        return new_dict
-    elif isinstance(state, list):
-        return [serialize_state(v) for v in state]
-    elif isinstance(state, pd.DataFrame):
-        return {
-            "__type__": "pd.DataFrame",
-            "data": state.to_json(orient="split", date_format="iso")
-        }
-    elif isinstance(state, pd.Series):
+    root = [None]
+    stack = [(state, root, 0)]
+    # DataFrames found during the walk, encoded together at the end: (parent, key, frame)
+    frames = []
+    while stack:
+        node, parent, key = stack.pop()
+        # JSON scalars (the bulk of the leaves) are kept as-is, without a json.dumps probe
+        if type(node) in _JSON_SCALAR_TYPES:
+            parent[key] = node
+        elif isinstance(node, pd.DataFrame):
+            frames.append((parent, key, node))
+        elif isinstance(node, dict):
+            new_dict = {}
+            parent[key] = new_dict
+            for k, v in node.items():
+                # Skip keys that are transient widgets (predicate inlined: runs once per key)
+                if type(k) is str and (k.startswith(_EXCLUDE_PREFIXES) or k in _EXCLUDE_EXACT):
+                    continue
+                # Ensure key is a string (JSON requirement)
+                k = str(k)
+                if type(v) in _JSON_SCALAR_TYPES:
+                    new_dict[k] = v
+                else:
+                    # Reserve the slot so the key order is kept
+                    new_dict[k] = None
+                    stack.append((v, new_dict, k))
+        elif isinstance(node, list):
+            new_list = list(node)
+            parent[key] = new_list
+            for i, v in enumerate(node):
+                if type(v) not in _JSON_SCALAR_TYPES:
+                    stack.append((v, new_list, i))
+        else:
+            parent[key] = _serialize_value(node)
+    for (parent, key, _), encoded in zip(frames, _serialize_dataframes([df for _, _, df in frames])):
+        parent[key] = encoded
+    return root[0]
+
+def _serialize_dataframes(frames):
+    """
+    Encode several DataFrames, preserving order.
+    Frames are independent and Arrow releases the GIL while converting columns, so
+    with several frames and CPUs they are encoded in a small thread pool.
+    """
+    n_jobs = min(os.cpu_count() or 1, len(frames), _MAX_ENCODE_WORKERS)
+    if n_jobs < 2:
+        return [_serialize_dataframe(df) for df in frames]
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(_serialize_dataframe, frames))
+
+def _serialize_value(state):
+    """Serialize a single non-container value (Series, datetime, numpy scalar, ...)."""
+    if isinstance(state, pd.Series):
         return {
             "__type__": "pd.Series",
             "data": state.to_json(orient="split", date_format="iso"),
@@ -44,55 +124,192 @@ def serialize_state(state):
     elif isinstance(state, (np.float64, np.float32)):
         return float(state)
     else:
+        # Other types (scalar subclasses, tuples, ...): keep them only if JSON accepts them
         try:
             json.dumps(state)
             return state
         except (TypeError, OverflowError):
             return str(state)
 
+def _serialize_dataframe(df):
+    """
+    Encode a DataFrame as an Arrow IPC stream (base64 text inside the JSON envelope):
+    native dtypes, index and timezone are kept and numbers are not formatted as text.
+    Falls back to the split-JSON format for frames Arrow would not give back unchanged:
+    non-str column or index labels (stored as strings by Arrow), nested cells such as
+    lists (read back as numpy arrays), mixed-type object columns, duplicate column names, ...
+    """
+    if not all(type(c) is str for c in df.columns) or not all(
+        n is None or type(n) is str for n in df.index.names
+    ):
+        return _serialize_dataframe_json(df)
+    try:
+        table = pa.Table.from_pandas(df)
+        if any(pa.types.is_nested(field.type) for field in table.schema):
+            return _serialize_dataframe_json(df)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return {
+            "__type__": "pd.DataFrame.arrow",
+            "data": base64.b64encode(sink.getvalue()).decode("ascii")
+        }
+    except (pa.ArrowException, TypeError, ValueError):
+        return _serialize_dataframe_json(df)
+
+def _serialize_dataframe_json(df):
+    return {
+        "__type__": "pd.DataFrame",
+        "data": df.to_json(orient="split", date_format="iso")
+    }
+
+def _restore_dates(values):
+    """Parse values written as ISO timestamps by to_json back to datetimes; other values are returned unchanged."""
+    first = next((v for v in values if v is not None), None)
+    if isinstance(first, str) and _ISO_DATETIME_RE.match(first):
+        try:
+            return pd.to_datetime(values, format="ISO8601")
+        except (ValueError, TypeError):
+            pass
+    return values
+
+def _frame_from_split_json(data):
+    """
+    Rebuild a DataFrame written by to_json(orient="split", date_format="iso").
+    Parsed once with json and built directly: values keep their JSON types and only
+    ISO timestamps (index or object columns) are converted, without read_json's type guessing.
+    """
+    parsed = json.loads(data)
+    df = pd.DataFrame(parsed["data"], columns=parsed["columns"])
+    df.index = pd.Index(_restore_dates(parsed["index"]))
+    for i, dtype in enumerate(df.dtypes):
+        if dtype == object:
+            df.isetitem(i, _restore_nulls_or_dates(df.iloc[:, i]))
+    return df
+
+def _restore_nulls_or_dates(column):
+    """All-null object columns become float64 NaN, as read_json loaded them; ISO timestamps become datetimes."""
+    if len(column) and column.isna().all():
+        return column.astype("float64")
+    return _restore_dates(column)
+
 def deserialize_state(state):
     """
-    Recursively deserialize a JSON-compatible structure back into original objects.
+    Deserialize a JSON-compatible structure back into original objects.
     Reconstructs pandas DataFrames from the custom dictionary format.
+    Walked with an explicit stack, like serialize_state.
     """
-    if isinstance(state, dict):
-        if state.get("__type__") == "pd.DataFrame":
-            try:
-                data = state["data"]
-                # New format: JSON string with ISO dates
-                if isinstance(data, str):
-                    return pd.read_json(StringIO(data), orient="split")
-                # Legacy format: Dictionary
-                else:
-                    return pd.DataFrame(data["data"], index=data["index"], columns=data["columns"])
-            except Exception:
-                return pd.DataFrame()
-        
-        elif state.get("__type__") == "pd.Series":
-            try:
-                data = state["data"]
-                # New format: JSON string
-                if isinstance(data, str):
-                    s = pd.read_json(StringIO(data), orient="split", typ="series")
-                    s.name = state.get("name")
-                    return s
-                # Legacy format: Dictionary
+    root = [None]
+    stack = [(state, root, 0)]
+    while stack:
+        node, parent, key = stack.pop()
+        # Exact type tests: the input comes from json, so only plain dicts and lists
+        node_type = type(node)
+        if node_type is dict:
+            # One tag lookup, then one dispatch (plain dicts have no "__type__")
+            tag = node.get("__type__")
+            if type(tag) is str:
+                handler = _TAG_HANDLERS.get(tag)
+                if handler is not None:
+                    parent[key] = handler(node)
+                    continue
+            new_dict = {}
+            parent[key] = new_dict
+            for k, v in node.items():
+                if type(v) in _CONTAINER_TYPES:
+                    # Reserve the slot so the key order is kept
+                    new_dict[k] = None
+                    stack.append((v, new_dict, k))
                 else:
-                    return pd.Series(state["data"], name=state.get("name"))
-            except Exception:
-                return pd.Series()
-        
-        elif state.get("__type__") == "datetime":
-            try:
-                # Return pandas Timestamp as it is more versatile and compatible with datetime
-                return pd.Timestamp(state["data"])
-            except Exception:
-                return None
-
-        return {k: deserialize_state(v) for k, v in state.items()}
-    
-    elif isinstance(state, list):
-        return [deserialize_state(v) for v in state]
-    
-    else:
-        return state
+                    new_dict[k] = v
+        elif node_type is list:
+            new_list = list(node)
+            parent[key] = new_list
+            for i, v in enumerate(node):
+                if type(v) in _CONTAINER_TYPES:
+                    stack.append((v, new_list, i))
+        else:
+            parent[key] = node
+    return root[0]
+
+def _load_arrow_dataframe(state):
+    try:
+        with pa.ipc.open_stream(base64.b64decode(state["data"])) as reader:
+            return reader.read_pandas()
+    except Exception:
+        return pd.DataFrame()
+
+def _load_dataframe(state):
+    try:
+        data = state["data"]
+        # New format: JSON string with ISO dates
+        if isinstance(data, str):
+            return _frame_from_split_json(data)
+        # Legacy format: Dictionary
+        else:
+            return pd.DataFrame(data["data"], index=data["index"], columns=data["columns"])
+    except Exception:
+        return pd.DataFrame()
+
+def _load_series(state):
+    try:
+        data = state["data"]
+        # New format: JSON string
+        if isinstance(data, str):
+            parsed = json.loads(data)
+            series = pd.Series(
+                _restore_dates(parsed["data"]),
+                index=pd.Index(_restore_dates(parsed["index"])),
+                name=state.get("name")
+            )
+            if series.dtype == object and len(series) and series.isna().all():
+                series = series.astype("float64")
+            return series
+        # Legacy format: Dictionary
+        else:
+            return pd.Series(state["data"], name=state.get("name"))
+    except Exception:
+        return pd.Series()
+
+def _load_datetime(state):
+    try:
+        # Return pandas Timestamp as it is more versatile and compatible with datetime
+        return pd.Timestamp(state["data"])
+    except Exception:
+        return None
+
+# "__type__" tag -> rebuild function for tagged dicts
+_TAG_HANDLERS = {
+    "pd.DataFrame.arrow": _load_arrow_dataframe,
+    "pd.DataFrame": _load_dataframe,
+    "pd.Series": _load_series,
+    "datetime": _load_datetime,
+}
+
+
+class LazyState(Mapping):
+    """
+    Read-only view of a serialized state dict whose heavy keys are deserialized on demand.
+    Keys listed in lazy_keys stay in their stored form until first accessed, then are
+    deserialized once and memoized; all other keys are deserialized up front.
+    """
+
+    def __init__(self, raw, lazy_keys=()):
+        self._raw = raw
+        self._lazy_keys = frozenset(lazy_keys)
+        self._cache = {k: deserialize_state(v) for k, v in raw.items() if k not in self._lazy_keys}
+
+    def __getitem__(self, key):
+        if key not in self._cache:
+            self._cache[key] = deserialize_state(self._raw[key])
+        return self._cache[key]
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def is_loaded(self, key):
+        """Return True if the value for key has already been deserialized."""
+        return key in self._cache
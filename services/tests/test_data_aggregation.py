@@ -0,0 +1,97 @@
+"""Test suite for the aggregation of consumer/producer curves.
+
+_build_consolidated_dataframe is compared with the former implementation,
+pd.DataFrame(ts_dict).resample("h").mean(), on irregular inputs.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import numpy as np
+import pandas as pd
+from services.data_aggregation import _build_consolidated_dataframe, _collect_series
+
+
+def legacy(ts_dict):
+    """Former consolidation: align the series in a DataFrame and average them per hour."""
+    return pd.DataFrame(ts_dict).resample("h").mean()
+
+
+def hourly(start, periods, offset=0.0):
+    idx = pd.date_range(start, periods=periods, freq="h")
+    return pd.Series(np.arange(periods, dtype=float) + offset, index=idx)
+
+
+def with_duplicate(series, position, value):
+    """Repeat the timestamp at `position` with another value."""
+    extra = pd.Series([value], index=series.index[[position]])
+    return pd.concat([series.iloc[: position + 1], extra, series.iloc[position + 1:]])
+
+
+def assert_matches(result, expected):
+    assert (result.dtypes == np.float32).all()
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_freq=False, rtol=1e-6)
+
+
+class TestBuildConsolidatedDataFrame:
+    """Test that the consolidated frame matches the former implementation."""
+
+    def test_hourly_grid(self):
+        """Aligned hourly curves skip the resample and give the same frame."""
+        ts = {"PDL_1": hourly("2024-01-01", 48), "PDL_2": hourly("2024-01-01", 48, 100.0)}
+        assert_matches(_build_consolidated_dataframe(ts), legacy(ts))
+
+    def test_duplicate_timestamps(self):
+        """Curves repeating different hours are averaged per hour instead of failing."""
+        ts = {
+            "PDL_1": with_duplicate(hourly("2024-01-01", 24), 5, 50.0),
+            "PDL_2": with_duplicate(hourly("2024-01-01", 24, 100.0), 9, 0.0),
+        }
+        # The former DataFrame(ts_dict) cannot align these: compare column by column
+        expected = pd.concat([legacy({name: s}) for name, s in ts.items()], axis=1)
+        assert_matches(_build_consolidated_dataframe(ts), expected)
+
+    def test_dst_naive_duplicates(self):
+        """The hour repeated at the October DST change, once the timezone is dropped, is averaged."""
+        idx = pd.date_range("2024-10-26 22:00", "2024-10-27 06:00", freq="h", tz="Europe/Paris")
+        naive = idx.tz_convert("Europe/Paris").tz_localize(None)
+        assert not naive.is_unique
+        ts = {
+            "PDL_1": pd.Series(np.arange(len(naive), dtype=float), index=naive),
+            "PDL_2": pd.Series(np.arange(len(naive), dtype=float) * 2, index=naive),
+        }
+        result = _build_consolidated_dataframe(ts)
+        assert result.index.is_unique
+        assert_matches(result, legacy(ts))
+
+    def test_half_hour_offset_curves(self):
+        """Curves sampled at :00 and :30 are averaged into the same hourly bins."""
+        half = hourly("2024-01-01", 24, 10.0)
+        half.index = half.index + pd.Timedelta(minutes=30)
+        ts = {"PDL_1": hourly("2024-01-01", 24), "PDL_2": half}
+        assert_matches(_build_consolidated_dataframe(ts), legacy(ts))
+
+    def test_disjoint_ranges(self):
+        """Curves covering disjoint periods keep the gap between them as NaN rows."""
+        ts = {"PDL_1": hourly("2024-01-01", 24), "PDL_2": hourly("2024-01-05", 24, 100.0)}
+        result = _build_consolidated_dataframe(ts)
+        assert result.loc["2024-01-03"].isna().all().all()
+        assert_matches(result, legacy(ts))
+
+
+class TestCollectSeries:
+    """Test how the curve of each point is found."""
+
+    def test_empty_curve_falls_back_to_curve_data(self):
+        """An empty value under the curve key falls back to curve_data."""
+        df = pd.DataFrame({"value": np.arange(24, dtype=float)}, index=pd.date_range("2024-01-01", periods=24, freq="h"))
+        points = [
+            {"nom": "A", "courbe_consommation": {}, "curve_data": df},
+            {"nom": "B", "courbe_consommation": df, "curve_data": {}},
+            {"nom": "C", "courbe_consommation": None},
+        ]
+        ts_dict, errors, with_data = _collect_series(points, "courbe_consommation", "Consumer")
+        assert list(ts_dict) == ["A", "B"]
+        assert with_data == 2
+        assert errors == ["Consumer 'C': no curve data"]
+        np.testing.assert_allclose(ts_dict["A"].to_numpy(), df["value"].to_numpy())
@@ -0,0 +1,102 @@
+"""Test suite for the project database services.
+
+Each test runs against a temporary SQLite file, including databases created by
+an older version of the schema.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import sessionmaker
+
+import services.database as database
+from services.models import Base, Dataset
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Point services.database at an empty temporary database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'projects.db'}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    yield database
+    engine.dispose()
+
+
+def make_legacy_db(db):
+    """Create the tables the way an older version did: without the (project_id, name) unique index."""
+    Base.metadata.create_all(bind=db.engine)
+    with db.engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_datasets_pid_name"))
+
+
+def add_dataset(db, project_id, name, created_at, data):
+    with db.session_scope() as session:
+        dataset = Dataset(
+            project_id=project_id, name=name, type="consumption_curve", file_type="json",
+            data=data, created_at=created_at,
+        )
+        session.add(dataset)
+        session.flush()
+        return dataset.id
+
+
+class TestInitDb:
+    """Test schema creation and migration of older databases."""
+
+    def test_duplicate_datasets_are_removed(self, db):
+        """Duplicated (project, name) datasets keep only the newest row before the unique index is built."""
+        make_legacy_db(db)
+        pid = db.save_project("p1", "precalibrage", {})
+        add_dataset(db, pid, "courbe", datetime(2024, 1, 1), {"v": "old"})
+        newest = add_dataset(db, pid, "courbe", datetime(2024, 6, 1), {"v": "new"})
+        add_dataset(db, pid, "courbe", datetime(2024, 3, 1), {"v": "middle"})
+        other = add_dataset(db, pid, "autre", datetime(2024, 1, 1), {"v": "other"})
+
+        db.init_db()
+
+        indexes = {ix["name"]: ix for ix in inspect(db.engine).get_indexes("datasets")}
+        assert indexes["ix_datasets_pid_name"]["unique"]
+        with db.session_scope() as session:
+            ids = sorted(session.scalars(select(Dataset.id)).all())
+        assert ids == sorted([newest, other])
+        assert db.load_dataset(newest)["data"] == {"v": "new"}
+
+    def test_init_db_is_idempotent(self, db):
+        """A second init_db on an up-to-date database is a no-op."""
+        db.init_db()
+        db.init_db()
+        assert "ix_datasets_pid_name" in {ix["name"] for ix in inspect(db.engine).get_indexes("datasets")}
+
+
+class TestSaveDataset:
+    """Test the (project_id, name) upsert of save_dataset."""
+
+    def test_upsert_on_database_without_unique_index(self, db):
+        """save_dataset works on an older database before any page has run init_db."""
+        make_legacy_db(db)
+        pid = db.save_project("p1", "precalibrage", {})
+
+        first = db.save_dataset(pid, "courbe", "consumption_curve", {"v": 1})
+        second = db.save_dataset(pid, "courbe", "consumption_curve", {"v": 2})
+
+        assert first == second
+        assert db.load_dataset(first)["data"] == {"v": 2}
+        assert len(db.list_datasets(pid)) == 1
+
+    def test_upsert_on_database_with_duplicates(self, db):
+        """Older duplicates are collapsed and the newest one is updated."""
+        make_legacy_db(db)
+        pid = db.save_project("p1", "precalibrage", {})
+        add_dataset(db, pid, "courbe", datetime(2024, 1, 1), {"v": "old"})
+        newest = add_dataset(db, pid, "courbe", datetime(2024, 6, 1), {"v": "new"})
+
+        saved = db.save_dataset(pid, "courbe", "consumption_curve", {"v": "saved"})
+
+        assert saved == newest
+        assert db.load_dataset(saved)["data"] == {"v": "saved"}
+        assert len(db.list_datasets(pid)) == 1
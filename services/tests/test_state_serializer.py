@@ -0,0 +1,132 @@
+"""Test suite for project state serialization.
+
+Round-trips DataFrames through serialize_state / deserialize_state (Arrow and
+split-JSON encodings) and loads payloads written by earlier formats.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import json
+
+import numpy as np
+import pandas as pd
+from services.state_serializer import serialize_state, deserialize_state
+
+
+def roundtrip(obj):
+    """Serialize, go through JSON text as when saved in the database, and deserialize."""
+    return deserialize_state(json.loads(json.dumps(serialize_state(obj))))
+
+
+class TestDataFrameRoundtrip:
+    """Test that DataFrames come back unchanged."""
+
+    def test_float32_hourly_frame(self):
+        """Consolidated float32 hourly frames use the Arrow encoding."""
+        idx = pd.date_range("2024-01-01", periods=48, freq="h")
+        df = pd.DataFrame(
+            {"PDL_1": np.arange(48, dtype=np.float32) / 3, "PDL_2": np.full(48, np.nan, dtype=np.float32)},
+            index=idx,
+        )
+        assert serialize_state({"df": df})["df"]["__type__"] == "pd.DataFrame.arrow"
+        pd.testing.assert_frame_equal(roundtrip({"df": df})["df"], df, check_freq=False)
+
+    def test_tz_aware_index(self):
+        """The index timezone is kept."""
+        idx = pd.date_range("2024-10-26 22:00", periods=6, freq="h", tz="Europe/Paris")
+        df = pd.DataFrame({"value": np.linspace(0.0, 1.0, 6)}, index=idx)
+        result = roundtrip({"df": df})["df"]
+        assert str(result.index.tz) == "Europe/Paris"
+        pd.testing.assert_frame_equal(result, df, check_freq=False)
+
+    def test_str_columns_with_leading_zeros(self):
+        """Codes stored as text keep their leading zeros."""
+        df = pd.DataFrame({"code_postal": ["01000", "09200", None], "nom": ["a", "b", "c"]})
+        result = roundtrip({"df": df})["df"]
+        assert result["code_postal"].tolist() == ["01000", "09200", None]
+        pd.testing.assert_frame_equal(result, df)
+
+    def test_int_column_labels(self):
+        """Non-str column labels fall back to split-JSON and keep their type."""
+        df = pd.DataFrame(np.arange(6).reshape(3, 2))
+        assert serialize_state({"df": df})["df"]["__type__"] == "pd.DataFrame"
+        result = roundtrip({"df": df})["df"]
+        assert result.columns.tolist() == [0, 1]
+        pd.testing.assert_frame_equal(result, df)
+
+    def test_mixed_column_labels(self):
+        """Mixed str/int column labels are not turned into strings."""
+        df = pd.DataFrame({"nom": ["a", "b"], 2024: [1.5, 2.5]})
+        result = roundtrip({"df": df})["df"]
+        assert result.columns.tolist() == ["nom", 2024]
+        pd.testing.assert_frame_equal(result, df)
+
+    def test_list_cells(self):
+        """List cells come back as lists."""
+        df = pd.DataFrame({"points": [[1, 2], [3]]})
+        result = roundtrip({"df": df})["df"]
+        assert result["points"].tolist() == [[1, 2], [3]]
+        assert isinstance(result["points"].iloc[0], list)
+
+
+class TestLegacyPayloads:
+    """Test loading payloads written by earlier serializers."""
+
+    def test_split_json_dataframe(self):
+        """DataFrames stored as split-JSON strings with ISO dates."""
+        payload = {
+            "df": {
+                "__type__": "pd.DataFrame",
+                "data": '{"columns":["code","val"],"index":["2024-01-01T00:00:00.000","2024-01-01T01:00:00.000"],'
+                        '"data":[["01234",1.5],["00042",2.0]]}',
+            },
+            "n": 3,
+        }
+        expected = pd.DataFrame(
+            {"code": ["01234", "00042"], "val": [1.5, 2.0]},
+            index=pd.DatetimeIndex(["2024-01-01 00:00", "2024-01-01 01:00"]),
+        )
+        state = deserialize_state(payload)
+        pd.testing.assert_frame_equal(state["df"], expected)
+        assert state["n"] == 3
+
+    def test_dict_dataframe(self):
+        """DataFrames stored as a plain split dict."""
+        payload = {
+            "__type__": "pd.DataFrame",
+            "data": {"columns": ["value"], "index": [0, 1], "data": [[1.0], [2.0]]},
+        }
+        expected = pd.DataFrame({"value": [1.0, 2.0]}, index=[0, 1])
+        pd.testing.assert_frame_equal(deserialize_state(payload), expected)
+
+    def test_split_json_series(self):
+        """Series stored as split-JSON strings."""
+        payload = {
+            "__type__": "pd.Series",
+            "data": '{"name":"val","index":["2024-01-01T00:00:00.000","2024-01-01T01:00:00.000"],"data":[1.5,2.0]}',
+            "name": "val",
+        }
+        expected = pd.Series(
+            [1.5, 2.0], index=pd.DatetimeIndex(["2024-01-01 00:00", "2024-01-01 01:00"]), name="val"
+        )
+        pd.testing.assert_series_equal(deserialize_state(payload), expected)
+
+    def test_all_null_columns_load_as_float(self):
+        """All-null columns and Series load as float64 NaN, as read_json returned them."""
+        frame = {
+            "__type__": "pd.DataFrame",
+            "data": '{"columns":["nom","valeur"],"index":[0,1],"data":[[null,1.5],[null,2.0]]}',
+        }
+        series = {
+            "__type__": "pd.Series",
+            "data": '{"name":"nom","index":[0,1],"data":[null,null]}',
+            "name": "nom",
+        }
+        df = deserialize_state(frame)
+        assert df["nom"].dtype == np.float64
+        assert df["nom"].isna().all()
+        assert df["valeur"].dtype == np.float64
+        result = deserialize_state(series)
+        assert result.dtype == np.float64
+        assert result.isna().all()
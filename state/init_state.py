@@ -28,5 +28,13 @@ DEFAULTS = {
 
 def init_session_state():
     """Initialize Streamlit session_state with standard keys and defaults."""
-    for key, value in DEFAULTS.items():
-        st.session_state.setdefault(key, value)
+    state = st.session_state
+    # Collect only the missing keys and write them in one update. List/dict defaults
+    # are copied so that sessions never share (and append to) the DEFAULTS objects.
+    missing = {
+        key: value.copy() if isinstance(value, (list, dict)) else value
+        for key, value in DEFAULTS.items()
+        if key not in state
+    }
+    if missing:
+        state.update(missing)
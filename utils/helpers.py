@@ -1,11 +1,14 @@
 import streamlit as st
 import pandas as pd
 import os
-import io
+import functools
+import itertools
+import shutil
 import zipfile
+from importlib.util import find_spec
 import folium
 from streamlit_folium import st_folium
-from geopy.geocoders import Nominatim
+from services.geolocation import _get_geocode
 
 # Basic constants
 H_UPLOADER_CONTAINER = 300
@@ -37,11 +40,40 @@ def get_coordinates_from_address(commune: str) -> dict:
     return {"lat": 48.8566, "lng": 2.3522, "epci": "Non trouvé"}
 
 
-@st.cache_data(ttl=3600)
+# Optional local table of French postal codes (CSV columns: postal_code, lat, lng, city),
+# e.g. extracted from La Poste's "Base officielle des codes postaux". When the file is
+# present, lookups are answered from memory and Nominatim is only queried for unknown codes.
+POSTAL_CODES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Resources", "fr_postal_codes.csv"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_postal_codes() -> dict:
+    """Load the local postal-code table once as {postal_code: coordinates dict} (empty if absent)."""
+    if not os.path.isfile(POSTAL_CODES_PATH):
+        return {}
+    try:
+        df = pd.read_csv(
+            POSTAL_CODES_PATH,
+            dtype={"postal_code": str},
+            usecols=["postal_code", "lat", "lng", "city"],
+        )
+    except (OSError, ValueError):
+        return {}
+    # Several communes can share a postal code: keep the first one listed
+    df = df.dropna(subset=["lat", "lng"]).drop_duplicates("postal_code")
+    return {
+        code: {"lat": float(lat), "lng": float(lng), "city": city, "epci": "N/A"}
+        for code, lat, lng, city in zip(df["postal_code"], df["lat"], df["lng"], df["city"])
+    }
+
+
 def get_coordinates_from_postal_code(postal_code: str) -> dict:
     """
-    Retrieve coordinates from postal code using Nominatim API (OpenStreetMap).
-    Results are cached for 1 hour to minimize API calls.
+    Retrieve coordinates from postal code.
+    Uses the local postal-code table when available (no network call), otherwise
+    the Nominatim API (OpenStreetMap), whose results are cached for 1 hour.
     
     Args:
         postal_code: French postal code (5 digits)
@@ -49,13 +81,23 @@ def get_coordinates_from_postal_code(postal_code: str) -> dict:
     Returns:
         dict with keys: lat, lng, city, epci
     """
+    local = _load_postal_codes().get(str(postal_code).strip())
+    if local is not None:
+        # Copy: callers must not modify the shared table
+        return dict(local)
+    return _geocode_postal_code(postal_code)
+
+
+@st.cache_data(ttl=3600)
+def _geocode_postal_code(postal_code: str) -> dict:
+    """Geocode a postal code with the Nominatim API (see get_coordinates_from_postal_code)."""
     try:
-        # Initialize Nominatim geocoder with a descriptive user_agent
-        geolocator = Nominatim(user_agent="acc_app_v1")
+        # Shared rate-limited geocoder of services.geolocation (same session and SSL context)
+        geocode = _get_geocode()
         
         # Search for postal code in France
         query = f"{postal_code}, France"
-        location = geolocator.geocode(query, timeout=10)
+        location = geocode(query, timeout=10)
         
         if location:
             # Extract city name from address if possible
@@ -86,54 +128,63 @@ def get_coordinates_from_postal_code(postal_code: str) -> dict:
         }
 
 
+_SIDEBAR_CSS = """
+<style>
+.sidebar-nav {
+    background: #f7f7f9;
+    padding: 0.75rem 0.85rem 1rem;
+    border-radius: 8px;
+    border: 1px solid #e0e0e5;
+}
+.sidebar-nav p {
+    margin: 0 0 6px;
+    font-size: 16px;
+    font-weight: 650;
+    color: #1f1f2e;
+}
+.sidebar-nav .stButton>button {
+    width: 100%;
+    font-size: 16px;
+    font-weight: 700;
+    padding: 0.55rem 0.6rem;
+}
+.sidebar-title {
+    font-size: 14px;
+    font-weight: 700;
+    letter-spacing: 0.2px;
+    color: #5b5b6b;
+    margin-bottom: 6px;
+}
+</style>
+"""
+
+_NAV_LABELS = (
+    "App",
+    "Infos générales",
+    "Points injection",
+    "Points soutirage",
+    "Points stockage",
+    "Clés répartition",
+    "Paramètres financiers",
+)
+
+# Static part of the navigation banner, sent as a single markdown element per rerun
+_SIDEBAR_HTML = (
+    _SIDEBAR_CSS
+    + "<div class='sidebar-nav'>"
+    + "<div class='sidebar-title'>📋 Navigation</div>"
+    + "".join(f"<p>{label}</p>" for label in _NAV_LABELS)
+    + "</div>"
+)
+
+
 def render_banner_with_navigation(current_page: int, banner_content=None):
     """Render left banner (1/4) with navigation structure, buttons, and project info."""
-    st.markdown(
-        """
-        <style>
-        .sidebar-nav {
-            background: #f7f7f9;
-            padding: 0.75rem 0.85rem 1rem;
-            border-radius: 8px;
-            border: 1px solid #e0e0e5;
-        }
-        .sidebar-nav p {
-            margin: 0 0 6px;
-            font-size: 16px;
-            font-weight: 650;
-            color: #1f1f2e;
-        }
-        .sidebar-nav .stButton>button {
-            width: 100%;
-            font-size: 16px;
-            font-weight: 700;
-            padding: 0.55rem 0.6rem;
-        }
-        .sidebar-title {
-            font-size: 14px;
-            font-weight: 700;
-            letter-spacing: 0.2px;
-            color: #5b5b6b;
-            margin-bottom: 6px;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
     banner_col, content_col = st.columns([0.25, 0.75], gap="large")
 
     with banner_col:
         with st.container(border=True):
-            st.markdown("<div class='sidebar-nav'>", unsafe_allow_html=True)
-            st.markdown("<div class='sidebar-title'>📋 Navigation</div>", unsafe_allow_html=True)
-            st.markdown("<p>App</p>", unsafe_allow_html=True)
-            st.markdown("<p>Infos générales</p>", unsafe_allow_html=True)
-            st.markdown("<p>Points injection</p>", unsafe_allow_html=True)
-            st.markdown("<p>Points soutirage</p>", unsafe_allow_html=True)
-            st.markdown("<p>Points stockage</p>", unsafe_allow_html=True)
-            st.markdown("<p>Clés répartition</p>", unsafe_allow_html=True)
-            st.markdown("<p>Paramètres financiers</p>", unsafe_allow_html=True)
+            st.markdown(_SIDEBAR_HTML, unsafe_allow_html=True)
 
             st.divider()
 
@@ -153,8 +204,6 @@ def render_banner_with_navigation(current_page: int, banner_content=None):
                 else:
                     st.button("Suivant →", disabled=True, width='stretch')
 
-            st.markdown("</div>", unsafe_allow_html=True)
-
         with st.expander("📊 Infos du projet", expanded=True):
             if banner_content:
                 banner_content()
@@ -216,9 +265,13 @@ def render_navigation_footer(current_page: int):
             st.button("Suivant →", disabled=True, width='stretch')
 
 
+# Rust-based Excel reader (python-calamine): much faster than openpyxl; used when installed
+EXCEL_ENGINE = "calamine" if find_spec("python_calamine") is not None else None
+
+
 def process_actors_file(uploaded_file, actor_type: str):
     try:
-        df = pd.read_excel(uploaded_file)
+        df = pd.read_excel(uploaded_file, engine=EXCEL_ENGINE)
     except Exception:
         # fallback: try reading as csv
         uploaded_file.seek(0)
@@ -228,10 +281,15 @@ def process_actors_file(uploaded_file, actor_type: str):
     st.session_state[f"msg_{actor_type}"] = f"Chargé {len(df)} acteurs"
 
 
-def _save_bytes_to_path(b: bytes, path: str):
+# Copy buffer for uploads and ZIP members written to disk
+_COPY_CHUNK_SIZE = 1 << 20
+
+
+def _save_stream_to_path(src, path: str):
+    """Copy a binary file object to path in fixed-size chunks (never held whole in memory)."""
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "wb") as f:
-        f.write(b)
+        shutil.copyfileobj(src, f, _COPY_CHUNK_SIZE)
 
 
 def process_curves_files(uploaded_files, actor_type: str, subdir: str):
@@ -241,26 +299,28 @@ def process_curves_files(uploaded_files, actor_type: str, subdir: str):
     for uf in uploaded_files:
         name = getattr(uf, "name", None) or f"uploaded_{saved}.dat"
         uf.seek(0)
-        content = uf.read()
         if name.lower().endswith(".zip"):
             try:
-                z = zipfile.ZipFile(io.BytesIO(content))
-                for info in z.infolist():
-                    if info.filename.lower().endswith(
-                        (".csv",)
-                    ):
-                        data = z.read(info.filename)
-                        _save_bytes_to_path(data, os.path.join(out_dir, os.path.basename(info.filename)))
-                        saved += 1
+                # Read the archive from the upload itself and stream each member to disk
+                with zipfile.ZipFile(uf) as z:
+                    for info in z.infolist():
+                        filename = info.filename
+                        if filename.lower().endswith(".csv"):
+                            with z.open(info) as src:
+                                _save_stream_to_path(src, os.path.join(out_dir, os.path.basename(filename)))
+                            saved += 1
             except Exception:
                 continue
         else:
-            _save_bytes_to_path(content, os.path.join(out_dir, name))
+            _save_stream_to_path(uf, os.path.join(out_dir, name))
             saved += 1
 
     st.session_state[f"msg_{actor_type}"] = f"Courbes: {saved} fichiers enregistrés dans {out_dir}"
 
 
+MAX_LISTED_CURVE_FILES = 50
+
+
 def render_actor_list(df, actor_type, curves_dir):
     if df is None:
         st.caption("Aucun acteur chargé")
@@ -268,11 +328,12 @@ def render_actor_list(df, actor_type, curves_dir):
         st.dataframe(df)
 
     if os.path.isdir(curves_dir):
-        files = os.listdir(curves_dir)
+        # Stop reading the directory after the 50 entries shown
+        with os.scandir(curves_dir) as entries:
+            files = [entry.name for entry in itertools.islice(entries, MAX_LISTED_CURVE_FILES)]
         if files:
-            st.markdown("**Fichiers de courbes:**")
-            for f in files[:50]:
-                st.write(f)
+            # One markdown element for the whole list instead of one st.write per file
+            st.markdown("**Fichiers de courbes:**\n" + "".join(f"\n- `{f}`" for f in files))
 
 
 def render_actor_block(block_title: str, actor_type: str, curves_subdir: str):